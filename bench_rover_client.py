@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import time
+import requests
+from rover_client import rover_client, DEFAULT_BASE_URL
+
+N_CALLS = 500
+
+def bench(name, call, n_calls = N_CALLS):
+    """
+    Function to measure the number of calls per second of a callable.
+
+    Parameters
+    ----------
+    name : string
+        The label printed with the result.
+    call : callable
+        The function to call (no arguments).
+    n_calls : int
+        The number of calls to perform.
+
+    Returns
+    -------
+    float
+        The calls per second.
+
+    """
+    start = time.perf_counter()
+    for i in range(n_calls):
+        call()
+    elapsed = time.perf_counter() - start
+    calls_per_second = n_calls / elapsed
+    print(name + ": " + str(round(calls_per_second, 1)) + " calls/sec")
+    return calls_per_second
+
+def opened_connections(client):
+    """
+    Function to count the connections opened by a rover_client so far.
+    If they are kept alive, this stays far below the number of calls.
+    """
+    pools = client.session.get_adapter(DEFAULT_BASE_URL).poolmanager.pools
+    return sum(pools[key].num_connections for key in pools.keys())
+
+def bench_rover_client():
+    """
+    Function to compare the rover_client (pooled keep-alive session) with
+     bare requests calls (new connection per call).
+    The rover_manager must be running (see README): it serves HTTP/1.1
+     keep-alive, so the client connections are reused.
+    Commands are only turns ('l', 'r'), so no obstacle can stop them.
+    """
+    data_post = {"rover_name": "r1", "command_string": "lr"}
+
+    bare_get = bench("requests.get /available_rovers",
+                     lambda: requests.get(DEFAULT_BASE_URL + "/available_rovers"))
+    bare_post = bench("requests.post /send_commands",
+                      lambda: requests.post(DEFAULT_BASE_URL + "/send_commands", data=data_post))
+
+    with rover_client() as client:
+        client_get = bench("rover_client.available_rovers",
+                           client.available_rovers)
+        client_post = bench("rover_client.send_commands",
+                            lambda: client.send_commands("r1", "lr"))
+        print("rover_client connections opened for " + str(2 * N_CALLS) + " calls: " +
+              str(opened_connections(client)))
+
+        # Batched: the commands submitted in a batch window are sent in a single request,
+        #  so this is a throughput of submitted commands, not of HTTP calls
+        start = time.perf_counter()
+        futures = [client.submit_commands("r1", "lr") for i in range(N_CALLS)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        print("rover_client.submit_commands: " + str(round(N_CALLS / elapsed, 1)) +
+              " submitted commands/sec (batched per request window, not comparable with calls/sec)")
+
+    print("\nSpeedup GET: " + str(round(client_get / bare_get, 2)) + "x")
+    print("Speedup POST: " + str(round(client_post / bare_post, 2)) + "x")
+
+if __name__ == '__main__':
+
+    bench_rover_client()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from uuid import uuid4
+
+class change_log:
+    """
+    Class to keep track of the rovers whose state changed.
+    Every recorded change bumps a monotonic version; each rover remembers only
+     the version of its last change, so the log size is bounded by the fleet size.
+    Rovers are kept ordered by version, so the changes after a cursor are found
+     scanning only the changed rovers (cost scales with activity, not fleet size).
+    Cursors given to the callers are strings "<epoch>:<version>": the epoch
+     identifies the log instance (a manager run), so a cursor of another run
+     (eg: kept by a dashboard across a manager restart) is recognized and the
+     whole fleet is returned, instead of silently missing the rovers reset
+     by the restart.
+      - version: the version of the last recorded change (0 if nothing changed).
+      - epoch: the unique identifier of this log instance.
+    """
+    def __init__(self):
+        self.version = 0
+        self.epoch = uuid4().hex
+        # {rover_name: version of the last change}, ordered by version
+        self.last_changes = OrderedDict()
+        self.lock = Lock()
+
+    def record(self, rover_name):
+        """
+        Record a change of a rover state.
+
+        Parameters
+        ----------
+        rover_name : string
+            The name of the changed rover.
+
+        Returns
+        -------
+        int
+            The new version.
+
+        """
+        with self.lock:
+            self.version += 1
+            self.last_changes[rover_name] = self.version
+            self.last_changes.move_to_end(rover_name)
+            return self.version
+
+    def changes_since(self, cursor = ""):
+        """
+        Find the rovers changed after the given cursor.
+
+        Parameters
+        ----------
+        cursor : string
+            The cursor returned by the previous call ("<epoch>:<version>").
+            An empty cursor, a cursor of another epoch or ahead of the current
+             version returns all the rovers, so no change is lost.
+
+        Raises
+        ------
+        ValueError
+            If the cursor version is not an integer.
+
+        Returns
+        -------
+        list
+            The names of the rovers changed after the cursor (oldest change first).
+        string
+            The current cursor, to be used in the next call.
+
+        """
+        epoch, _, version = cursor.rpartition(":")
+        version = int(version) if version else 0
+        with self.lock:
+            if epoch != self.epoch or version > self.version:
+                version = 0
+            changed = []
+            for rover_name, last_version in reversed(self.last_changes.items()):
+                if last_version <= version:
+                    break
+                changed.append(rover_name)
+            changed.reverse()
+            return changed, self.epoch + ":" + str(self.version)
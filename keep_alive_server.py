@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+
+# Seconds after which an idle kept-alive connection is closed by the server
+KEEP_ALIVE_TIMEOUT = 5
+# Maximum unread request body (bytes) discarded to keep a connection alive:
+#  bigger leftovers close the connection instead
+MAX_DISCARDED_BODY = 65536
+
+class request_body_reader:
+    """
+    File-like reader of a request body, limited to its Content-Length.
+    It keeps track of the bytes left unread by the application, which must be
+     discarded before reading the next request of the connection (otherwise
+     they would be parsed as a new request).
+      - rfile: the connection input stream.
+      - content_length: the length of the request body.
+    """
+    def __init__(self, rfile, content_length):
+        self.rfile = rfile
+        self.remaining = content_length
+
+    def limit(self, size):
+        if size is None or size < 0 or size > self.remaining:
+            return self.remaining
+        return size
+
+    def read(self, size = -1):
+        data = self.rfile.read(self.limit(size))
+        self.remaining = self.remaining - len(data) if data else 0
+        return data
+
+    def readline(self, size = -1):
+        data = self.rfile.readline(self.limit(size))
+        self.remaining = self.remaining - len(data) if data else 0
+        return data
+
+    def readlines(self, hint = -1):
+        return list(self)
+
+    def __iter__(self):
+        line = self.readline()
+        while line:
+            yield line
+            line = self.readline()
+
+    def discard(self):
+        """
+        Read and drop the unread part of the body.
+
+        Returns
+        -------
+        bool
+            True if the whole body has been consumed (the connection can be reused).
+            False if it is too big to be discarded or the client closed the connection.
+
+        """
+        if self.remaining > MAX_DISCARDED_BODY:
+            return False
+        try:
+            while self.remaining > 0:
+                if not self.read(self.remaining):
+                    return False
+        except OSError:
+            # Timeout waiting for the rest of the body, or connection reset
+            return False
+        return True
+
+class keep_alive_server_handler(ServerHandler):
+    """
+    WSGI handler answering with HTTP/1.1 (wsgiref default is HTTP/1.0,
+     which makes clients close the connection after every response).
+    """
+    http_version = "1.1"
+    content_length_sent = False
+
+    def close(self):
+        # Headers are discarded by close: checking them before
+        self.content_length_sent = self.headers is not None and "Content-Length" in self.headers
+        super().close()
+
+class keep_alive_request_handler(WSGIRequestHandler):
+    """
+    Request handler serving many requests on the same connection (HTTP/1.1 keep-alive).
+    wsgiref handles a single request per connection: here requests are read
+     until the client asks to close, the connection stays idle for
+     KEEP_ALIVE_TIMEOUT seconds or a response has no Content-Length
+     (its end could not be found by the client without closing).
+    The request body left unread by the application is discarded before the
+     next request (or the connection is closed).
+    To be used with bottle: run(app, handler_class = keep_alive_request_handler,
+     server_class = threading_wsgi_server)
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body are written separately: without this, on a kept-alive
+    #  connection each response waits for the client delayed ACK
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def handle_one_request(self):
+        """
+        Handle a single HTTP request (same steps of WSGIRequestHandler.handle).
+        """
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except OSError:
+            # Idle timeout or connection reset by the client
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            self.close_connection = True
+            return
+
+        # Also sets close_connection from the request version and 'Connection' header
+        if not self.parse_request(): # An error code has been sent, just exit
+            return
+
+        # Chunked bodies are not supported by wsgiref: their end is unknown
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self.close_connection = True
+        try:
+            content_length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            content_length = 0
+            self.close_connection = True
+        body = request_body_reader(self.rfile, content_length)
+
+        handler = keep_alive_server_handler(
+            body, self.wfile, self.get_stderr(), self.get_environ(),
+            multithread=True,
+        )
+        handler.request_handler = self      # backpointer for logging
+        handler.run(self.server.get_app())
+        if not handler.content_length_sent or not body.discard():
+            self.close_connection = True
+
+class threading_wsgi_server(ThreadingMixIn, WSGIServer):
+    """
+    WSGI server handling each connection in its own thread, so that an idle
+     kept-alive connection does not block the other clients.
+    """
+    daemon_threads = True
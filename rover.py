@@ -3,10 +3,34 @@
 @author: Tommaso
 """
 
-from random import random
+from hashlib import sha256
+from random import Random
 
 DEFAULT_DIMENSION_GRID_X= 100
 DEFAULT_DIMENSION_GRID_Y = 100
+DEFAULT_MASTER_SEED = 0
+
+def derive_seed(master_seed, name):
+    """
+    Derive the seed of a rover random stream from the master seed and the rover name.
+    A cryptographic hash is used (instead of hash()) so that the derived seed
+     is the same in every process and streams of different rovers are independent.
+
+    Parameters
+    ----------
+    master_seed : int
+        The seed shared by all the rovers of a run.
+    name : string
+        The rover name.
+
+    Returns
+    -------
+    int
+        The seed of the rover random stream.
+
+    """
+    digest = sha256((str(master_seed) + ":" + str(name)).encode("UTF-8")).digest()
+    return int.from_bytes(digest[:8], "big")
 
 class rover:
     """
@@ -24,6 +48,16 @@ class rover:
         Conventionally setting constants as global variables (in this module).
       - prob_obstacles: represents the probability to find obstacles: [0, 1]
         Default value is 0
+      - name: the rover name, used to derive its random stream.
+        If not provided, a unique name is given by creation order ("unnamed_<n>").
+      - terrain_map: the map of the planet (see terrain_map module). Default to None.
+        If provided, the grid dimensions are the map ones and the probability
+         to find an obstacle is read from the map cell the rover is moving to
+         (prob_obstacles is then not used).
+      - master_seed: the seed of the run. Default to DEFAULT_MASTER_SEED.
+        Each rover owns an independent random stream derived from
+         master_seed and name, so a run can be replayed exactly (also when
+         rovers are moved concurrently) by using the same master seed and names.
     """
     def __init__(self,
                x_init = 0,
@@ -31,7 +65,15 @@ class rover:
                orientation_init = 'N',
                prob_obstacles_init = 0.,
                dimension_grid_x_init = DEFAULT_DIMENSION_GRID_X,
-               dimension_grid_y_init = DEFAULT_DIMENSION_GRID_Y):
+               dimension_grid_y_init = DEFAULT_DIMENSION_GRID_Y,
+               name_init = "",
+               master_seed_init = DEFAULT_MASTER_SEED,
+               terrain_map_init = None):
+        
+        self.terrain_map = terrain_map_init
+        if self.terrain_map is not None:
+            dimension_grid_x_init = self.terrain_map.dimension_grid_x
+            dimension_grid_y_init = self.terrain_map.dimension_grid_y
         
         if (dimension_grid_x_init <= 0): # NOTE: also a 1x1 grid has no meaning, but for now it will be allowed
             print("Warning: x grid dimension cannot be < 0. Setting it to MAX_GRID_X (100).")
@@ -69,15 +111,49 @@ class rover:
         
         self.known_commands = "fblr"
         
+        # Number of commands executed by the last call of execute_command_string
+        self.executed_commands = 0
+        
+        if (name_init == ""):
+            # Unnamed rovers would all share the same random stream
+            rover.unnamed_rovers += 1
+            self.name = "unnamed_" + str(rover.unnamed_rovers)
+            print("Warning: rover name not provided. Setting name = '" + self.name + "' (depends on creation order).")
+        else:
+            self.name = name_init
+        self.set_seed(master_seed_init)
+        
     # Using this shared class variable to compact the code for turning command ('l', 'r')
     ordered_orientations = "NESW"
     
+    # Counter used to give unique names (and so independent random streams) to unnamed rovers
+    unnamed_rovers = 0
+    
+    def set_seed(self, master_seed):
+        """
+        (Re)start the rover random stream from the given master seed.
+        Drawn values only depend on master_seed and the rover name.
+
+        Parameters
+        ----------
+        master_seed : int
+            The seed shared by all the rovers of a run.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.master_seed = master_seed
+        self.rng = Random(derive_seed(master_seed, self.name))
+    
     def execute_command_string(self, command_string):
         """
         Function that tries to execute the commands in the command string.
         Allowed commands are ['f', 'b', 'l', 'r']
         If an invalid command is found, the execution is not performed.
         The execution starts and goes until the command string ends or an obstacle is found.
+        The number of executed commands is stored in executed_commands.
         
         Parameters
         ----------
@@ -90,6 +166,7 @@ class rover:
             Message describing a successful execution or obstacle detection details
 
         """
+        self.executed_commands = 0
         check, details = self.check_valid_command_string(command_string)
         if not(check):
             return "Error: invalid command.", details + "\nExiting execution (no command has been executed)."
@@ -98,7 +175,7 @@ class rover:
             # If moving (commands 'f' or 'b' received), checking for obstacles
             #  See check_for_obstacles method for details and obstacles assumptions
             if command == 'f' or command == 'b':
-                if self.check_for_obstacle():
+                if self.check_for_obstacle(command):
                     # evaluating the obstacle position
                     x_obstacle, y_obstacle = self.obstacle_position(command)
                     response = "ABORTING. Reason: Found obstacle."
@@ -115,6 +192,7 @@ class rover:
                     return response, details
             
             self.move(command)
+            self.executed_commands += 1
         
         return "All commands successfully executed.", ""
                     
@@ -231,15 +309,24 @@ class rover:
         return
 
     
-    def check_for_obstacle(self):
+    def check_for_obstacle(self, command = None):
         """
         Method to simulate obstacles.
-        Simulating obstacles using random numbers
+        Simulating obstacles using random numbers from the rover own stream
+         (see set_seed), so that results do not depend on other rovers.
          Arbitrariry choosing prob obstacle = 1/10
         Assuming obstacles are only visible when approaching the new location
          from a nearby one (cannot detect obstacles from far away)
         NOTE: with this approach the assumption is that new obstacle can arise
         in already explored places (and can disappear where already found).
+        If the rover has a terrain map, the probability is the one of the map
+         cell the rover is moving to.
+        
+        Parameters
+        ----------
+        command : CHARACTER
+            The moving command ('f' or 'b') about to be executed.
+            Only needed (and then required) if the rover has a terrain map.
         
         Returns
         -------
@@ -247,7 +334,13 @@ class rover:
         
 
         """
-        return random() < self.prob_obstacles
+        if self.terrain_map is None:
+            prob_obstacle = self.prob_obstacles
+        elif command is None:
+            raise ValueError("The moving command is required to check obstacles on the terrain map.")
+        else:
+            prob_obstacle = self.terrain_map.get_obstacle_probability(*self.obstacle_position(command))
+        return self.rng.random() < prob_obstacle
     
     def obstacle_position(self, command):
         if command == 'f':
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import asyncio
+import threading
+from ast import literal_eval
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "http://localhost:8080"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.1
+# Time window (in seconds) in which submitted commands are collected in a single request
+DEFAULT_BATCH_WINDOW = 0.01
+# Commands known by the rovers (checked before sending a batch)
+KNOWN_COMMANDS = "fblr"
+
+
+def check_command_string(command_string):
+    """
+    Check that a command string only has known commands (the manager would
+     reject it, and ',' would split it in the batch request).
+
+    Parameters
+    ----------
+    command_string : string
+        The string representing the list of commands.
+
+    Raises
+    ------
+    ValueError
+        If an unknown command is found.
+
+    """
+    for command in command_string:
+        if command not in KNOWN_COMMANDS:
+            raise ValueError("Unknown command: " + str(command) +
+                             "\nAllowed commands are: [f, b, l, r]")
+
+
+class rover_client_error(Exception):
+    """
+    Exception raised when the rover_manager answers with an error status.
+      - status_code: the HTTP status code of the response.
+      - message: the body of the response (the manager feedback).
+    """
+    def __init__(self, status_code, message):
+        super().__init__(str(status_code) + ": " + message)
+        self.status_code = status_code
+        self.message = message
+
+
+class rover_status:
+    """
+    Class to represent the rover status returned by the rover_manager
+     after a command string is sent ('/send_commands').
+    Fields mirror the keys of the manager response:
+      - result: "Result", main feedback of the execution.
+      - details: "Details", details of the feedback (empty if no problem occurred).
+      - x, y: current coordinates of the rover.
+      - orientation: current orientation of the rover.
+      - executed: "Executed", the number of executed commands of the string.
+    """
+    def __init__(self, result, details, x, y, orientation, executed = None):
+        self.result = result
+        self.details = details
+        self.x = x
+        self.y = y
+        self.orientation = orientation
+        self.executed = executed
+
+    @classmethod
+    def from_response_text(cls, text):
+        """
+        Build a rover_status from the body of a '/send_commands' response.
+
+        Parameters
+        ----------
+        text : string
+            The decoded body of the response (the string representation
+             of the status dictionary).
+
+        Returns
+        -------
+        rover_status
+
+        """
+        fields = literal_eval(text)
+        return cls(fields["Result"],
+                   fields["Details"],
+                   fields["x"],
+                   fields["y"],
+                   fields["orientation"],
+                   fields.get("Executed"))
+
+    def __eq__(self, other):
+        if not isinstance(other, rover_status):
+            return NotImplemented
+        return (self.result == other.result and
+                self.details == other.details and
+                self.x == other.x and
+                self.y == other.y and
+                self.orientation == other.orientation and
+                self.executed == other.executed)
+
+    def __repr__(self):
+        return ("rover_status(result=" + repr(self.result) +
+                ", details=" + repr(self.details) +
+                ", x=" + str(self.x) +
+                ", y=" + str(self.y) +
+                ", orientation=" + repr(self.orientation) +
+                ", executed=" + str(self.executed) + ")")
+
+
+class rover_client:
+    """
+    Class to talk to the rover_manager server.
+    All the requests go through a single requests.Session, so that the TCP
+     connections are kept alive and reused (pooled) instead of being opened
+     for every call (the server must support HTTP/1.1 keep-alive, as the
+     rover_manager does with keep_alive_server).
+      - base_url: the address of the rover_manager.
+      - pool_size: the maximum number of connections kept alive.
+      - retries: the number of retries for failing requests.
+        Connection errors are always retried, read errors and 502/503/504
+         answers are retried only for GET requests (sending a command string
+         twice would move the rover twice).
+      - backoff_factor: the exponential backoff factor between retries.
+      - batch_window: the time window (seconds) used by submit_commands
+         to collect commands before sending them.
+    """
+    def __init__(self,
+                 base_url = DEFAULT_BASE_URL,
+                 pool_size = DEFAULT_POOL_SIZE,
+                 retries = DEFAULT_RETRIES,
+                 backoff_factor = DEFAULT_BACKOFF_FACTOR,
+                 batch_window = DEFAULT_BATCH_WINDOW):
+
+        self.base_url = base_url.rstrip('/')
+        self.batch_window = batch_window
+
+        retry = Retry(total = retries,
+                      backoff_factor = backoff_factor,
+                      status_forcelist = (502, 503, 504),
+                      allowed_methods = frozenset(["GET"]),
+                      raise_on_status = False)
+        adapter = HTTPAdapter(pool_connections = 1,
+                              pool_maxsize = pool_size,
+                              max_retries = retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Commands waiting to be sent: {rover_name: [(command_string, future), ...]}
+        self._pending = {}
+        self._batch_lock = threading.Lock()
+        self._flush_timer = None
+        # Held while a batch is sent, so batches of a rover are sent in submission order
+        self._flush_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Send the pending commands (if any) and close the pooled connections.
+        """
+        self.flush()
+        self.session.close()
+
+    def available_rovers(self):
+        """
+        Fetch the rovers managed by the rover_manager.
+
+        Returns
+        -------
+        string
+            The manager representation of the managed rovers.
+
+        """
+        response = self.session.get(self.base_url + "/available_rovers")
+        return self._check_response(response)
+
+    def changes(self, since = ""):
+        """
+        Fetch the rovers whose state changed after a cursor.
+
+        Parameters
+        ----------
+        since : string
+            The cursor returned by the previous call ("" to get all the rovers).
+            All the rovers are also returned if the cursor is of a previous
+             manager run.
+
+        Returns
+        -------
+        dict
+            The changed rovers: {rover_name: {"x": x, "y": y, "orientation": orientation}}.
+        string
+            The current cursor, to be used in the next call.
+
+        """
+        response = self.session.get(self.base_url + "/changes", params={"since": since})
+        fleet_changes = literal_eval(self._check_response(response))
+        return fleet_changes["rovers"], fleet_changes["cursor"]
+
+    def send_commands(self, rover_name, command_string):
+        """
+        Send a command string to a rover and wait for the answer.
+
+        Parameters
+        ----------
+        rover_name : string
+            The name of the rover in the manager.
+        command_string : string
+            The string representing the list of commands.
+
+        Returns
+        -------
+        rover_status
+            The status of the rover after the execution.
+
+        """
+        data_post = {"rover_name": rover_name, "command_string": command_string}
+        response = self.session.post(self.base_url + "/send_commands", data=data_post)
+        return rover_status.from_response_text(self._check_response(response))
+
+    def send_commands_batch(self, rover_name, command_strings):
+        """
+        Send several command strings to a rover in a single request.
+        Each string is executed on its own, as if sent with send_commands
+         one after the other (an obstacle only stops its own string).
+
+        Parameters
+        ----------
+        rover_name : string
+            The name of the rover in the manager.
+        command_strings : list of string
+            The command strings, in execution order.
+
+        Returns
+        -------
+        list of rover_status
+            The status of the rover after the execution of each string.
+
+        """
+        for command_string in command_strings:
+            check_command_string(command_string)
+        data_post = {"rover_name": rover_name, "command_strings": ",".join(command_strings)}
+        response = self.session.post(self.base_url + "/send_commands_batch", data=data_post)
+        return [rover_status(fields["Result"], fields["Details"],
+                             fields["x"], fields["y"], fields["orientation"],
+                             fields["Executed"])
+                for fields in literal_eval(self._check_response(response))]
+
+    def submit_commands(self, rover_name, command_string):
+        """
+        Queue a command string for a rover without waiting for the answer.
+        The command strings submitted to the same rover within batch_window
+         seconds are sent in a single request (see send_commands_batch), in
+         submission order. Each one is still executed on its own, so the
+         outcome is the same as calling send_commands for each submission.
+        Invalid command strings are rejected immediately (never sent).
+
+        Parameters
+        ----------
+        rover_name : string
+            The name of the rover in the manager.
+        command_string : string
+            The string representing the list of commands.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future resolved with the rover_status of the submission
+             (or with the raised exception, ValueError for invalid commands).
+
+        """
+        future = Future()
+        try:
+            check_command_string(command_string)
+        except ValueError as e:
+            future.set_exception(e)
+            return future
+        with self._batch_lock:
+            self._pending.setdefault(rover_name, []).append((command_string, future))
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.batch_window, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return future
+
+    def flush(self):
+        """
+        Send immediately all the commands queued by submit_commands.
+        """
+        with self._flush_lock:
+            with self._batch_lock:
+                pending, self._pending = self._pending, {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+
+            for rover_name, queued in pending.items():
+                # Cancelled submissions (eg: awaiting task cancelled) are not sent,
+                #  the others can no longer be cancelled, so resolving them cannot fail
+                queued = [(commands, future) for commands, future in queued
+                          if future.set_running_or_notify_cancel()]
+                if not queued:
+                    continue
+                try:
+                    statuses = self.send_commands_batch(rover_name, [commands for commands, _ in queued])
+                    if len(statuses) != len(queued):
+                        raise ValueError("Expected " + str(len(queued)) + " statuses in the batch answer, got " +
+                                         str(len(statuses)) + ".")
+                except Exception as e:
+                    for _, future in queued:
+                        future.set_exception(e)
+                    continue
+
+                for (_, future), status in zip(queued, statuses):
+                    future.set_result(status)
+
+    async def available_rovers_async(self):
+        """
+        Asynchronous version of available_rovers.
+        """
+        return await asyncio.to_thread(self.available_rovers)
+
+    async def changes_async(self, since = ""):
+        """
+        Asynchronous version of changes.
+        """
+        return await asyncio.to_thread(self.changes, since)
+
+    async def send_commands_async(self, rover_name, command_string):
+        """
+        Asynchronous version of send_commands.
+        """
+        return await asyncio.to_thread(self.send_commands, rover_name, command_string)
+
+    async def submit_commands_async(self, rover_name, command_string):
+        """
+        Asynchronous version of submit_commands: awaits the submission result.
+        """
+        return await asyncio.wrap_future(self.submit_commands(rover_name, command_string))
+
+    @staticmethod
+    def _check_response(response):
+        text = response.content.decode("UTF-8")
+        if response.status_code != 200:
+            raise rover_client_error(response.status_code, text)
+        return text
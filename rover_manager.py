@@ -4,21 +4,47 @@
 """
 
 from rover import rover, DEFAULT_DIMENSION_GRID_X, DEFAULT_DIMENSION_GRID_Y
+from change_log import change_log
+from keep_alive_server import keep_alive_request_handler, threading_wsgi_server
+from threading import Lock
+from urllib.parse import unquote_plus
 from bottle import get, post, request, Bottle, run, response
-from random import seed
 
-# Setting seed for tests
-seed(1234)
+# Master seed of the run: every rover derives its own random stream from it and its name
+MASTER_SEED = 1234
 
 # Supposing there is already 1 rover initialized
-r1 = rover(0, 0, 'N', 0.1)
+r1 = rover(0, 0, 'N', 0.1, name_init = "r1", master_seed_init = MASTER_SEED)
 # Using in-memory variables for simplicity
 #  (in a real world scenario there would be an online database, or other things)
 managed_rovers = {"r1": r1}
 
+# Log of the rover state changes (used by '/changes' to send only the changed rovers)
+fleet_changes = change_log()
+for rover_name in managed_rovers:
+    fleet_changes.record(rover_name)
+
+# Requests are served by concurrent threads: rover states are changed and read under this lock
+rovers_lock = Lock()
+
 # Initializing application
 rover_manager = Bottle()
 
+# Function to execute a command string on a managed rover (rovers_lock must be held)
+#  and to return the rover status
+def execute_on_rover(rover_name, command_string):
+    acting_rover = managed_rovers[rover_name]
+    state_before = (acting_rover.x, acting_rover.y, acting_rover.orientation)
+    r, d = acting_rover.execute_command_string(command_string)
+    if state_before != (acting_rover.x, acting_rover.y, acting_rover.orientation):
+        fleet_changes.record(rover_name)
+    return {"Result": r,
+            "Details": d, 
+            "x": acting_rover.x,
+            "y": acting_rover.y,
+            "orientation": acting_rover.orientation,
+            "Executed": acting_rover.executed_commands}
+
 # Function to return available rovers
 @rover_manager.get('/available_rovers')
 def return_rovers():
@@ -53,16 +79,66 @@ def apply_command_string():
         response.status = "400 Bad request"
         return "Rover name not found in managed rovers list."
     
-    acting_rover = managed_rovers[info_dictio["rover_name"]]
-    r, d = acting_rover.execute_command_string(command_string)
-    rover_status = {"Result": r,
-                    "Details": d, 
-                    "x": acting_rover.x,
-                    "y": acting_rover.y,
-                    "orientation": acting_rover.orientation}
-
+    with rovers_lock:
+        rover_status = execute_on_rover(info_dictio["rover_name"], command_string)
     
     return str(rover_status)
 
 
-run(rover_manager, host='localhost', port=8080)
\ No newline at end of file
+# Function to send to an existing rover several command strings (separated by ',')
+#  Each string is executed on its own, as if sent to '/send_commands' one after
+#  the other, and the list of the rover statuses (one per string) is returned.
+@rover_manager.post('/send_commands_batch')
+def apply_command_strings():
+    data_pairs = str(request.body.read().decode("UTF-8")).split('&')
+    info_dictio = {}
+    for pair in data_pairs:
+        key, value = pair.split("=")
+        info_dictio[key] = unquote_plus(value)
+    
+    if "rover_name" not in info_dictio:
+        response.status = "400 Bad request"
+        return "'rover_name' key not found."
+
+    if "command_strings" not in info_dictio:
+        response.status = "400 Bad request"
+        return "'command_strings' key-value not found."
+    
+    if info_dictio["rover_name"] not in managed_rovers:
+        response.status = "400 Bad request"
+        return "Rover name not found in managed rovers list."
+    
+    # Holding the lock for the whole batch: no other command is executed in between
+    with rovers_lock:
+        rover_statuses = [execute_on_rover(info_dictio["rover_name"], command_string)
+                          for command_string in info_dictio["command_strings"].split(",")]
+    
+    return str(rover_statuses)
+
+
+# Function to return only the rovers changed after a cursor returned by a previous call
+#  (eg: /changes?since=<epoch>:3). Without cursor (or with a cursor of a previous
+#  manager run) all the rovers are returned.
+@rover_manager.get('/changes')
+def return_changes():
+    changed_rovers = {}
+    with rovers_lock:
+        try:
+            changed, cursor = fleet_changes.changes_since(request.query.get("since", ""))
+        except ValueError:
+            response.status = "400 Bad request"
+            return "'since' must be a cursor returned by '/changes'."
+        for rover_name in changed:
+            changed_rover = managed_rovers[rover_name]
+            changed_rovers[rover_name] = {"x": changed_rover.x,
+                                          "y": changed_rover.y,
+                                          "orientation": changed_rover.orientation}
+    
+    return str({"cursor": cursor, "rovers": changed_rovers})
+
+
+# Using a threaded HTTP/1.1 server so that clients can keep their connections alive
+#  (bottle default wsgiref server closes the connection after every response)
+run(rover_manager, host='localhost', port=8080,
+    server_class=threading_wsgi_server,
+    handler_class=keep_alive_request_handler)
\ No newline at end of file
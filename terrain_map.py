@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import json
+import mmap
+import os
+from collections import OrderedDict
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_MAX_CACHED_TILES = 64
+# Each cell is stored in 2 bytes: terrain code and obstacle probability
+BYTES_PER_CELL = 2
+# Obstacle probabilities are stored as integers in [0, MAX_OBSTACLE_LEVEL]
+MAX_OBSTACLE_LEVEL = 255
+HEADER_FILE_NAME = "map.json"
+
+class terrain_map:
+    """
+    Class to represent the planet map with per-cell terrain and obstacle data.
+    The grid is split in square tiles of tile_size x tile_size cells, each one
+     stored in its own binary file in the map directory.
+    Tiles are memory-mapped only when a cell inside them is accessed, and at
+     most max_cached_tiles stay mapped (least recently used ones are closed),
+     so memory is bounded whatever the grid dimensions are.
+    Missing tile files are read as all-zero cells (terrain 0, no obstacles)
+     and are created only when a cell is written, so only the tiles with some
+     content take disk space.
+      - directory: the map directory (it must contain the header written by create).
+      - max_cached_tiles: the maximum number of tiles kept mapped.
+      - writable: if True, cells can be changed with set_cell.
+    """
+    def __init__(self, directory, max_cached_tiles = DEFAULT_MAX_CACHED_TILES, writable = False):
+        with open(os.path.join(directory, HEADER_FILE_NAME)) as header_file:
+            header = json.load(header_file)
+        self.directory = directory
+        self.dimension_grid_x = header["dimension_grid_x"]
+        self.dimension_grid_y = header["dimension_grid_y"]
+        self.tile_size = header["tile_size"]
+        self.max_cached_tiles = max(1, max_cached_tiles)
+        self.writable = writable
+        # {(tile_x, tile_y): (file, mmap)}, ordered from the least recently used
+        #  (an entry is (None, None) for a missing tile opened read-only)
+        self.cached_tiles = OrderedDict()
+
+    @classmethod
+    def create(cls, directory, dimension_grid_x, dimension_grid_y, tile_size = DEFAULT_TILE_SIZE,
+               max_cached_tiles = DEFAULT_MAX_CACHED_TILES):
+        """
+        Create an empty map (no tile is written) and open it for writing.
+        A directory already holding a map is refused (its tile files would be
+         read back as content of the new map).
+
+        Parameters
+        ----------
+        directory : string
+            The map directory (created if it does not exist).
+        dimension_grid_x, dimension_grid_y : int
+            The grid dimensions.
+        tile_size : int
+            The side of a tile, in cells.
+        max_cached_tiles : int
+            The maximum number of tiles kept mapped.
+
+        Returns
+        -------
+        terrain_map
+
+        """
+        if dimension_grid_x <= 0 or dimension_grid_y <= 0 or tile_size <= 0:
+            raise ValueError("Grid and tile dimensions must be > 0.")
+        os.makedirs(directory, exist_ok = True)
+        if os.path.exists(os.path.join(directory, HEADER_FILE_NAME)):
+            raise FileExistsError("A map already exists in " + directory + ".")
+        with open(os.path.join(directory, HEADER_FILE_NAME), "x") as header_file:
+            json.dump({"dimension_grid_x": dimension_grid_x,
+                       "dimension_grid_y": dimension_grid_y,
+                       "tile_size": tile_size}, header_file)
+        return cls(directory, max_cached_tiles, writable = True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close all the mapped tiles (changes are flushed to the files).
+        """
+        while self.cached_tiles:
+            self.evict_tile()
+
+    def get_cell(self, x, y):
+        """
+        Read a cell of the map.
+
+        Parameters
+        ----------
+        x, y : int
+            The cell coordinates.
+
+        Returns
+        -------
+        int
+            The terrain code of the cell.
+        float
+            The probability to find an obstacle in the cell: [0, 1]
+
+        """
+        tile, offset = self.locate(x, y)
+        if tile is None:
+            return 0, 0.
+        return tile[offset], tile[offset + 1] / MAX_OBSTACLE_LEVEL
+
+    def get_terrain(self, x, y):
+        """
+        Read the terrain code of a cell (see get_cell).
+        """
+        return self.get_cell(x, y)[0]
+
+    def get_obstacle_probability(self, x, y):
+        """
+        Read the obstacle probability of a cell (see get_cell).
+        """
+        return self.get_cell(x, y)[1]
+
+    def set_cell(self, x, y, terrain = 0, obstacle_probability = 0.):
+        """
+        Write a cell of the map (the map must be writable).
+
+        Parameters
+        ----------
+        x, y : int
+            The cell coordinates.
+        terrain : int
+            The terrain code: [0, 255]
+        obstacle_probability : float
+            The probability to find an obstacle in the cell: [0, 1]
+            It is stored with a resolution of 1/MAX_OBSTACLE_LEVEL.
+
+        Returns
+        -------
+        None.
+
+        """
+        if not self.writable:
+            raise ValueError("Map opened read-only.")
+        if not 0 <= terrain <= 255:
+            raise ValueError("Terrain code must be in [0, 255].")
+        if not 0. <= obstacle_probability <= 1.:
+            raise ValueError("Obstacle probability must be in [0, 1].")
+        tile, offset = self.locate(x, y, create = True)
+        tile[offset] = terrain
+        tile[offset + 1] = round(obstacle_probability * MAX_OBSTACLE_LEVEL)
+
+    def locate(self, x, y, create = False):
+        """
+        Find the mapped tile containing a cell and the cell offset in it.
+        Returns None as tile if the tile file does not exist and create is False.
+        """
+        if not (0 <= x < self.dimension_grid_x and 0 <= y < self.dimension_grid_y):
+            raise IndexError("Cell [" + str(x) + ", " + str(y) + "] out of grid range.")
+        tile_key = (x // self.tile_size, y // self.tile_size)
+        offset = ((y % self.tile_size) * self.tile_size + (x % self.tile_size)) * BYTES_PER_CELL
+        if tile_key in self.cached_tiles and (self.cached_tiles[tile_key][1] is not None or not create):
+            self.cached_tiles.move_to_end(tile_key)
+        else:
+            # A missing tile is mapped again (creating its file) when it is written
+            self.cached_tiles.pop(tile_key, None)
+            if len(self.cached_tiles) >= self.max_cached_tiles:
+                self.evict_tile()
+            self.cached_tiles[tile_key] = self.open_tile(tile_key, create)
+        return self.cached_tiles[tile_key][1], offset
+
+    def open_tile(self, tile_key, create = False):
+        """
+        Open and map the file of a tile (creating it if create is True).
+        Returns (None, None) if the file does not exist and create is False.
+        """
+        path = os.path.join(self.directory, "tile_" + str(tile_key[0]) + "_" + str(tile_key[1]) + ".bin")
+        tile_bytes = self.tile_size * self.tile_size * BYTES_PER_CELL
+        if not os.path.exists(path) and not create:
+            return None, None
+        if self.writable:
+            tile_file = open(path, "r+b" if os.path.exists(path) else "w+b")
+            if os.path.getsize(path) < tile_bytes:
+                # Zero-filled (and sparse where the filesystem allows it)
+                tile_file.truncate(tile_bytes)
+            return tile_file, mmap.mmap(tile_file.fileno(), tile_bytes, access = mmap.ACCESS_WRITE)
+        tile_file = open(path, "rb")
+        return tile_file, mmap.mmap(tile_file.fileno(), tile_bytes, access = mmap.ACCESS_READ)
+
+    def evict_tile(self):
+        """
+        Close the least recently used tile.
+        """
+        tile_key, (tile_file, tile) = self.cached_tiles.popitem(last = False)
+        if tile is not None:
+            tile.close()
+            tile_file.close()
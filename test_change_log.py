@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+from change_log import change_log
+
+def test_change_log():
+    """
+    Function to test the change_log functionalities.
+
+    Tests:
+        1. Empty log
+        2. Recording changes
+        3. Changes since a cursor
+        4. Repeated changes of the same rover
+        5. Cursor ahead of the current version
+        6. Cursor of a previous run
+
+    Returns
+    -------
+    int
+        The number of the test that is failing.
+        0 is returned if all tests are ok.
+
+    """
+
+    # 1. Empty log
+    print("\nStarting test 1...\n")
+    log = change_log()
+    def cursor(version):
+        return log.epoch + ":" + str(version)
+    if log.changes_since() != ([], cursor(0)):
+        print("Failed test 1: empty log.\n")
+        return 1
+    else:
+        print("\nPassed!\n")
+
+    # 2. Recording changes
+    print("\nStarting test 2...\n")
+    versions = [log.record("r1"), log.record("r2"), log.record("r3")]
+    if (versions != [1, 2, 3] or
+        log.changes_since() != (["r1", "r2", "r3"], cursor(3))):
+        print("Failed test 2: recording changes.\n")
+        return 2
+    else:
+        print("\nPassed!\n")
+
+    # 3. Changes since a cursor
+    print("\nStarting test 3...\n")
+    if (log.changes_since(cursor(1)) != (["r2", "r3"], cursor(3)) or
+        log.changes_since(cursor(3)) != ([], cursor(3))):
+        print("Failed test 3: changes since a cursor.\n")
+        return 3
+    else:
+        print("\nPassed!\n")
+
+    # 4. Repeated changes of the same rover
+    print("\nStarting test 4...\n")
+    log.record("r1")
+    log.record("r1")
+    if (log.changes_since(cursor(3)) != (["r1"], cursor(5)) or
+        log.changes_since(cursor(0)) != (["r2", "r3", "r1"], cursor(5)) or
+        log.changes_since(cursor(2)) != (["r3", "r1"], cursor(5))):
+        print("Failed test 4: repeated changes of the same rover.\n")
+        return 4
+    else:
+        print("\nPassed!\n")
+
+    # 5. Cursor ahead of the current version
+    print("\nStarting test 5...\n")
+    if log.changes_since(cursor(10**9)) != (["r2", "r3", "r1"], cursor(5)):
+        print("Failed test 5: cursor ahead of the current version.\n")
+        return 5
+    else:
+        print("\nPassed!\n")
+
+    # 6. Cursor of a previous run (eg: kept by a dashboard across a manager restart),
+    #  with a version already reached by the new run
+    print("\nStarting test 6...\n")
+    old_cursor = cursor(2)
+    log = change_log()
+    log.record("r1")
+    log.record("r2")
+    log.record("r3")
+    if (log.changes_since(old_cursor) != (["r1", "r2", "r3"], cursor(3)) or
+        log.changes_since("2") != (["r1", "r2", "r3"], cursor(3))):
+        print("Failed test 6: cursor of a previous run.\n")
+        return 6
+    try:
+        log.changes_since(log.epoch + ":a")
+        print("Failed test 6: invalid cursor accepted.\n")
+        return 6
+    except ValueError:
+        print("\nPassed!\n")
+
+    return 0
+
+if __name__=='__main__':
+
+    test_change_log()
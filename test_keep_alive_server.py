@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import threading
+from http.client import HTTPConnection
+from wsgiref.simple_server import make_server
+from keep_alive_server import keep_alive_request_handler, threading_wsgi_server
+
+class quiet_request_handler(keep_alive_request_handler):
+    def log_request(self, *args, **kw):
+        pass
+
+def test_keep_alive_server():
+    """
+    Function to test the keep-alive server with a plain WSGI application
+     (started on a free local port).
+
+    Tests:
+        1. Many requests on the same connection
+        2. Request body read by the application
+        3. Request body not read by the application (unknown route)
+
+    Returns
+    -------
+    int
+        The number of the test that is failing.
+        0 is returned if all tests are ok.
+
+    """
+    served_paths = []
+
+    def application(environ, start_response):
+        served_paths.append(environ["PATH_INFO"])
+        if environ["PATH_INFO"] == "/echo":
+            body = environ["wsgi.input"].read(int(environ.get("CONTENT_LENGTH") or 0))
+            status = "200 OK"
+        elif environ["PATH_INFO"] == "/ok":
+            body = b"ok"
+            status = "200 OK"
+        else:
+            # Answering without reading the request body
+            body = b"not found"
+            status = "404 Not Found"
+        start_response(status, [("Content-Length", str(len(body)))])
+        return [body]
+
+    server = make_server("localhost", 0, application, threading_wsgi_server, quiet_request_handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = HTTPConnection("localhost", server.server_port, timeout=5)
+
+    try:
+        # 1. Many requests on the same connection
+        print("\nStarting test 1...\n")
+        responses = []
+        for i in range(3):
+            connection.request("GET", "/ok")
+            responses.append(connection.getresponse().read())
+        first_socket = connection.sock
+        connection.request("GET", "/ok")
+        connection.getresponse().read()
+        if (responses != [b"ok"] * 3 or
+            connection.sock is not first_socket):
+            print("Failed test 1: many requests on the same connection.\n")
+            return 1
+        else:
+            print("\nPassed!\n")
+
+        # 2. Request body read by the application
+        print("\nStarting test 2...\n")
+        connection.request("POST", "/echo", body=b"rover_name=r1&command_string=ff")
+        echoed = connection.getresponse().read()
+        connection.request("GET", "/ok")
+        if (echoed != b"rover_name=r1&command_string=ff" or
+            connection.getresponse().read() != b"ok"):
+            print("Failed test 2: request body read by the application.\n")
+            return 2
+        else:
+            print("\nPassed!\n")
+
+        # 3. Request body not read by the application (unknown route):
+        #  the body must not be parsed as a new request
+        print("\nStarting test 3...\n")
+        del served_paths[:]
+        connection.request("POST", "/nope", body=b"GET /smuggled HTTP/1.1\r\n\r\n")
+        response = connection.getresponse()
+        response.read()
+        connection.request("GET", "/ok")
+        if (response.status != 404 or
+            connection.getresponse().read() != b"ok" or
+            served_paths != ["/nope", "/ok"]):
+            print("Failed test 3: request body not read by the application.\n")
+            return 3
+        else:
+            print("\nPassed!\n")
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+    return 0
+
+if __name__=='__main__':
+
+    test_keep_alive_server()
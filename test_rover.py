@@ -3,11 +3,10 @@
 @author: Tommaso
 """
 
-from random import seed
 from rover import rover, DEFAULT_DIMENSION_GRID_X, DEFAULT_DIMENSION_GRID_Y
 
-# setting seed for tests
-seed(123)
+# master seed for tests (each rover derives its own random stream from it)
+MASTER_SEED = 123
 
 def test_rover():
     """
@@ -24,6 +23,7 @@ def test_rover():
         8. Wrapping coordinates after move
         9. Long path with no obstacles
         10. Prob obstacles = 1
+        11. Replayable random streams (same master seed and name)
 
     Returns
     -------
@@ -289,6 +289,39 @@ def test_rover():
     else:
         print("\nPassed!\n")
     
+    # 11. Replayable random streams (same master seed and name)
+    print("\nStarting test 11...\n")
+    commands = "ffrffrflbbbffffrfffbbl" * 20
+    r11_a = rover(0, 0, 'N', 0.3, name_init = "r11", master_seed_init = MASTER_SEED)
+    r11_b = rover(0, 0, 'N', 0.3, name_init = "r11", master_seed_init = MASTER_SEED)
+    r11_other = rover(0, 0, 'N', 0.3, name_init = "other", master_seed_init = MASTER_SEED)
+    results_a = []
+    results_b = []
+    # Interleaving the rovers must not change the results of each one
+    for i in range(20):
+        results_a.append(r11_a.execute_command_string(commands))
+        r11_other.execute_command_string(commands)
+    for i in range(20):
+        results_b.append(r11_b.execute_command_string(commands))
+    if (results_a != results_b or
+        not(test_rover_status(r11_b, r11_a.x, r11_a.y, r11_a.orientation))):
+        print("Failed test 11.1: replayable random streams.\n")
+        return 11
+    
+    # Restarting the stream replays the same run
+    r11_b = rover(0, 0, 'N', 0.3, name_init = "r11")
+    r11_b.set_seed(MASTER_SEED)
+    if [r11_b.execute_command_string(commands) for i in range(20)] != results_a:
+        print("Failed test 11.2: replayable random streams (set_seed).\n")
+        return 11
+    
+    # Unnamed rovers get different names (and so independent random streams)
+    if rover().name == rover().name:
+        print("Failed test 11.3: unnamed rovers sharing the random stream.\n")
+        return 11
+    else:
+        print("\nPassed!\n")
+    
     return 0
 
 
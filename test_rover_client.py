@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import asyncio
+from rover_client import rover_client, rover_client_error, rover_status
+
+def test_rover_client():
+    """
+    Function to test the rover_client against the rover_manager server.
+
+    Tests:
+        1. Parsing the manager status response
+        2. Fetching rovers
+        3. Sending correct commands
+        4. Sending wrong rover name
+        5. Batched commands
+        6. Asynchronous API
+        7. Fetching changes since a cursor
+
+    Returns
+    -------
+    int
+        The number of the test that is failing.
+        0 is returned if all tests are ok.
+
+    """
+
+    # 1. Parsing the manager status response
+    print("\nStarting test 1...\n")
+    text = str({"Result": "All commands successfully executed.",
+                "Details": "",
+                "x": 1,
+                "y": 2,
+                "orientation": 'E'})
+    if (rover_status.from_response_text(text) !=
+        rover_status("All commands successfully executed.", "", 1, 2, 'E')):
+        print("Failed test 1: parsing the manager status response.\n")
+        return 1
+
+    print("\nPassed!\n")
+
+    with rover_client() as client:
+
+        # 2. Fetching rovers
+        print("\nStarting test 2...\n")
+        rovers = client.available_rovers()
+        if "r1" not in rovers:
+            print("Failed test 2: fetching rovers.\n")
+            return 2
+
+        print(rovers)
+
+        print("\nPassed!\n")
+
+        # 3. Sending correct commands
+        print("\nStarting test 3...\n")
+        status = client.send_commands("r1", "ffrffrflb")
+        if not isinstance(status, rover_status):
+            print("Failed test 3: sending correct commands.\n")
+            return 3
+
+        print(status)
+
+        print("\nPassed!\n")
+
+        # 4. Sending wrong rover name
+        print("\nStarting test 4...\n")
+        try:
+            client.send_commands("wrong_name", "ffrffrflb")
+            print("Failed test 4: sending wrong rover name (no error raised).\n")
+            return 4
+        except rover_client_error as e:
+            if (e.status_code != 400 or
+                e.message != "Rover name not found in managed rovers list."):
+                print("Failed test 4: sending wrong rover name.\n")
+                return 4
+
+        print("\nPassed!\n")
+
+        # 5. Batched commands
+        print("\nStarting test 5...\n")
+        # Each submission gets the rover status after its own commands (one more left turn)
+        futures = [client.submit_commands("r1", "l") for i in range(4)]
+        statuses = [future.result(timeout=5) for future in futures]
+        if (any(s.result != "All commands successfully executed." or s.executed != 1 for s in statuses) or
+            any("NESW".find(statuses[i + 1].orientation) != ("NESW".find(statuses[i].orientation) - 1) % 4
+                for i in range(3))):
+            print("Failed test 5.1: batched commands.\n")
+            return 5
+
+        print(statuses)
+
+        # An invalid submission is rejected alone, the others of the batch are executed
+        futures = [client.submit_commands("r1", command_string) for command_string in ("l", "zz", "r")]
+        try:
+            futures[1].result(timeout=5)
+            print("Failed test 5.2: invalid batched commands (no error raised).\n")
+            return 5
+        except ValueError:
+            pass
+        if any(futures[i].result(timeout=5).result != "All commands successfully executed." or
+               futures[i].result(timeout=5).executed != 1 for i in (0, 2)):
+            print("Failed test 5.2: invalid batched commands.\n")
+            return 5
+
+        # Each submission keeps its own outcome: an obstacle only stops its own commands
+        #  (manager answer stubbed to force the obstacle)
+        with rover_client() as stubbed_client:
+            sent = []
+            def send_commands_batch(rover_name, command_strings):
+                sent.append((rover_name, command_strings))
+                return [rover_status("ABORTING. Reason: Found obstacle.", "Obstacle position:...", 0, 1, 'N', 1),
+                        rover_status("All commands successfully executed.", "", 1, 1, 'E', 2)]
+            stubbed_client.send_commands_batch = send_commands_batch
+            futures = [stubbed_client.submit_commands("r1", "fff"),
+                       stubbed_client.submit_commands("r1", "rf")]
+            statuses = [future.result(timeout=5) for future in futures]
+        if (sent != [("r1", ["fff", "rf"])] or
+            statuses[0].result != "ABORTING. Reason: Found obstacle." or
+            statuses[0].executed != 1 or
+            statuses[1].result != "All commands successfully executed." or
+            statuses[1].executed != 2 or
+            (statuses[1].x, statuses[1].y, statuses[1].orientation) != (1, 1, 'E')):
+            print("Failed test 5.3: batched commands with obstacle.\n")
+            return 5
+
+        # A cancelled submission is not sent and does not stop the others of the batch
+        with rover_client(batch_window = 60) as stubbed_client:
+            sent = []
+            def send_commands_batch(rover_name, command_strings):
+                sent.append((rover_name, command_strings))
+                return [rover_status("All commands successfully executed.", "", 0, 0, 'N', len(c))
+                        for c in command_strings]
+            stubbed_client.send_commands_batch = send_commands_batch
+            futures = [stubbed_client.submit_commands("r1", "f"),
+                       stubbed_client.submit_commands("r1", "b"),
+                       stubbed_client.submit_commands("r2", "ff")]
+            futures[0].cancel()
+            stubbed_client.flush()
+            if (sent != [("r1", ["b"]), ("r2", ["ff"])] or
+                not futures[0].cancelled() or
+                futures[1].result(timeout=5).executed != 1 or
+                futures[2].result(timeout=5).executed != 2):
+                print("Failed test 5.4: cancelled batched commands.\n")
+                return 5
+
+        print("\nPassed!\n")
+
+        # 6. Asynchronous API
+        print("\nStarting test 6...\n")
+        async def send_all():
+            return await asyncio.gather(client.send_commands_async("r1", "r"),
+                                        client.submit_commands_async("r1", "l"))
+        statuses = asyncio.run(send_all())
+        if not all(isinstance(s, rover_status) for s in statuses):
+            print("Failed test 6: asynchronous API.\n")
+            return 6
+
+        print("\nPassed!\n")
+
+        # 7. Fetching changes since a cursor
+        print("\nStarting test 7...\n")
+        rovers, cursor = client.changes()
+        client.send_commands("r1", "r")
+        changed_rovers, new_cursor = client.changes(cursor)
+        epoch, version = cursor.split(":")
+        if (new_cursor != epoch + ":" + str(int(version) + 1) or
+            list(changed_rovers.keys()) != ["r1"] or
+            client.changes(new_cursor) != ({}, new_cursor) or
+            client.changes("previous_run:" + version)[0] != client.changes()[0]):
+            print("Failed test 7: fetching changes since a cursor.\n")
+            return 7
+
+        print("\nPassed!\n")
+
+    return 0
+
+if __name__=='__main__':
+
+    test_rover_client()
@@ -4,6 +4,7 @@
 """
 
 import requests
+from ast import literal_eval
 
 def test_rover_manager():
     """
@@ -14,6 +15,8 @@ def test_rover_manager():
         2. Sending correct data via POST request
         3. Sending wrong rover name
         4. Missing data in request
+        5. Fetching changes since a cursor
+        6. Sending several command strings in a batch
 
     Returns
     -------
@@ -77,6 +80,67 @@ def test_rover_manager():
 
     print("\nPassed!\n")
 
+    # 5. Fetching changes since a cursor
+    print("\nStarting test 5...\n")
+    response = requests.get("http://localhost:8080/changes")
+    if response.status_code != 200:
+        print("Failed test 5.1: fetching all changes.\n")
+        return 5
+    fleet_changes = literal_eval(response.content.decode("UTF-8"))
+    if "r1" not in fleet_changes["rovers"]:
+        print("Failed test 5.1: fetching all changes.\n")
+        return 5
+    
+    cursor = fleet_changes["cursor"]
+    response = requests.get("http://localhost:8080/changes", params={"since": cursor})
+    if (response.status_code != 200 or
+        literal_eval(response.content.decode("UTF-8")) != {"cursor": cursor, "rovers": {}}):
+        print("Failed test 5.2: fetching changes with up-to-date cursor.\n")
+        return 5
+    
+    # Turning always changes the state (no obstacle can stop it)
+    data_post = {"rover_name": "r1", "command_string": "l"}
+    requests.post("http://localhost:8080/send_commands", data=data_post)
+    response = requests.get("http://localhost:8080/changes", params={"since": cursor})
+    fleet_changes = literal_eval(response.content.decode("UTF-8"))
+    epoch, version = cursor.split(":")
+    if (fleet_changes["cursor"] != epoch + ":" + str(int(version) + 1) or
+        list(fleet_changes["rovers"].keys()) != ["r1"]):
+        print("Failed test 5.3: fetching changes after a command.\n")
+        return 5
+    
+    response = requests.get("http://localhost:8080/changes", params={"since": epoch + ":a"})
+    if (response.status_code != 400 or
+        response.content.decode("UTF-8") != "'since' must be a cursor returned by '/changes'."):
+        print("Failed test 5.4: wrong cursor.\n")
+        return 5
+    
+    # Cursor of a previous manager run: all the rovers are returned
+    response = requests.get("http://localhost:8080/changes", params={"since": "previous_run:" + version})
+    if "r1" not in literal_eval(response.content.decode("UTF-8"))["rovers"]:
+        print("Failed test 5.5: cursor of a previous run.\n")
+        return 5
+
+    print("\nPassed!\n")
+
+    # 6. Sending several command strings in a batch (each one executed on its own)
+    print("\nStarting test 6...\n")
+    data_post = {"rover_name": "r1", "command_strings": "l,zz,r"}
+    response = requests.post("http://localhost:8080/send_commands_batch", data=data_post)
+    if response.status_code != 200:
+        print("Failed test 6: sending several command strings in a batch.\n")
+        return 6
+    rover_statuses = literal_eval(response.content.decode("UTF-8"))
+    if ([s["Result"] for s in rover_statuses] != ["All commands successfully executed.",
+                                                   "Error: invalid command.",
+                                                   "All commands successfully executed."] or
+        [s["Executed"] for s in rover_statuses] != [1, 0, 1] or
+        "NESW".find(rover_statuses[0]["orientation"]) != ("NESW".find(rover_statuses[2]["orientation"]) - 1) % 4):
+        print("Failed test 6: sending several command strings in a batch.\n")
+        return 6
+
+    print("\nPassed!\n")
+
 if __name__=='__main__':
     
     test_rover_manager()
\ No newline at end of file
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Tommaso
+"""
+
+import os
+import tempfile
+from rover import rover
+from terrain_map import terrain_map
+
+# Planet-scale grid: only the written tiles are stored
+DIMENSION_GRID = 100000
+
+def test_terrain_map():
+    """
+    Function to test the terrain_map functionalities and its use by the rover.
+
+    Tests:
+        1. Empty map
+        2. Writing and reading cells
+        3. LRU tile cache
+        4. Reopening the map read-only (and refusing to create it again)
+        5. Rover moving on the map
+
+    Returns
+    -------
+    int
+        The number of the test that is failing.
+        0 is returned if all tests are ok.
+
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        # 1. Empty map
+        print("\nStarting test 1...\n")
+        planet = terrain_map.create(directory, DIMENSION_GRID, DIMENSION_GRID, 64, 2)
+        if (planet.get_cell(0, 0) != (0, 0.) or
+            planet.get_cell(DIMENSION_GRID - 1, DIMENSION_GRID - 1) != (0, 0.)):
+            print("Failed test 1: empty map.\n")
+            return 1
+        else:
+            print("\nPassed!\n")
+
+        # 2. Writing and reading cells
+        print("\nStarting test 2...\n")
+        planet.set_cell(0, 1, 3, 1.)
+        planet.set_cell(DIMENSION_GRID - 1, 0, 7, 1.)
+        planet.set_cell(50000, 50000, 2, 0.5)
+        if (planet.get_cell(0, 1) != (3, 1.) or
+            planet.get_cell(DIMENSION_GRID - 1, 0) != (7, 1.) or
+            planet.get_terrain(50000, 50000) != 2 or
+            abs(planet.get_obstacle_probability(50000, 50000) - 0.5) > 1 / 255 or
+            planet.get_cell(1, 1) != (0, 0.)):
+            print("Failed test 2: writing and reading cells.\n")
+            return 2
+        else:
+            print("\nPassed!\n")
+
+        # 3. LRU tile cache
+        print("\nStarting test 3...\n")
+        # Last accessed tiles are (781, 781) and (0, 0): tile (1562, 0) has been closed
+        if (list(planet.cached_tiles.keys()) != [(781, 781), (0, 0)]):
+            print("Failed test 3: LRU tile cache.\n")
+            return 3
+        planet.close()
+        tile_files = [f for f in os.listdir(directory) if f.startswith("tile_")]
+        if len(tile_files) != 3:
+            print("Failed test 3: LRU tile cache (unexpected tile files).\n")
+            return 3
+        else:
+            print("\nPassed!\n")
+
+        # 4. Reopening the map read-only
+        print("\nStarting test 4...\n")
+        with terrain_map(directory) as planet:
+            if (planet.dimension_grid_x != DIMENSION_GRID or
+                planet.get_cell(0, 1) != (3, 1.) or
+                planet.get_cell(12345, 67890) != (0, 0.)):
+                print("Failed test 4: reopening the map read-only.\n")
+                return 4
+            try:
+                planet.set_cell(0, 0, 1)
+                print("Failed test 4: writing a read-only map.\n")
+                return 4
+            except ValueError:
+                pass
+            try:
+                terrain_map.create(directory, 10, 10)
+                print("Failed test 4: creating a map over an existing one.\n")
+                return 4
+            except FileExistsError:
+                pass
+            print("\nPassed!\n")
+
+            # 5. Rover moving on the map
+            print("\nStarting test 5...\n")
+            r5 = rover(0, 0, 'N', terrain_map_init = planet)
+            r, d = r5.execute_command_string("f")
+            if (r != "ABORTING. Reason: Found obstacle." or
+                not d.startswith("Obstacle position:[x = 0, y = 1]\n") or
+                r5.dimension_grid_x != DIMENSION_GRID or
+                (r5.x, r5.y) != (0, 0)):
+                print("Failed test 5.1: rover moving on the map (obstacle).\n")
+                return 5
+            # Wrapping to the other side of the grid to reach the obstacle at x = DIMENSION_GRID - 1
+            r, d = r5.execute_command_string("lf")
+            if (r != "ABORTING. Reason: Found obstacle." or
+                not d.startswith("Obstacle position:[x = " + str(DIMENSION_GRID - 1) + ", y = 0]\n")):
+                print("Failed test 5.2: rover moving on the map (wrapped obstacle).\n")
+                return 5
+            r, d = r5.execute_command_string("lffff")
+            if (r != "All commands successfully executed." or
+                (r5.x, r5.y, r5.orientation) != (0, DIMENSION_GRID - 4, 'S')):
+                print("Failed test 5.3: rover moving on the map (free cells).\n")
+                return 5
+            try:
+                r5.check_for_obstacle()
+                print("Failed test 5.4: checking obstacles on the map without command.\n")
+                return 5
+            except ValueError:
+                pass
+            print("\nPassed!\n")
+
+    return 0
+
+if __name__=='__main__':
+
+    test_terrain_map()